@@ -36,23 +36,17 @@ async def async_setup(hass: HomeAssistant, _: dict) -> bool:
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Remote Media Player from a config entry."""
-    try:
-        # Initialize coordinator with config entry
-        coordinator = RemoteMediaPlayerCoordinator(hass, entry)
+    # Initialize coordinator with config entry
+    coordinator = RemoteMediaPlayerCoordinator(hass, entry)
 
-        # Set up the coordinator
-        await coordinator.async_setup()
+    try:
+        # Connect and fetch the initial state
+        await coordinator.async_config_entry_first_refresh()
 
         # Store coordinator for use by platforms
         hass.data[DOMAIN][entry.entry_id] = coordinator
 
-        # Set up platforms
-        await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
-
-        # Register update listener for config changes
-        entry.async_on_unload(entry.add_update_listener(async_reload_entry))
-
-        # Register device
+        # Register device (synchronous) before the platforms are forwarded
         device_registry = dr.async_get(hass)
         device_registry.async_get_or_create(
             config_entry_id=entry.entry_id,
@@ -62,8 +56,17 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             model="Media Player",
             sw_version="0.0.0",
         )
+
+        # Set up platforms
+        await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+
+        # Register update listener for config changes
+        entry.async_on_unload(entry.add_update_listener(async_reload_entry))
     except Exception as ex:
         LOGGER.error("Failed to set up Remote Media Player: %s", ex)
+        # Close the connection, so a retried setup doesn't leave it open
+        hass.data[DOMAIN].pop(entry.entry_id, None)
+        await coordinator.async_disconnect()
         raise ConfigEntryNotReady from ex
     else:
         return True
@@ -79,7 +82,7 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         coordinator: RemoteMediaPlayerCoordinator = hass.data[DOMAIN][entry.entry_id]
 
         # Close the WebSocket connection
-        await coordinator.client.disconnect()
+        await coordinator.async_disconnect()
 
         # Remove config entry from domain data
         hass.data[DOMAIN].pop(entry.entry_id)
@@ -4,10 +4,12 @@ from __future__ import annotations
 
 import asyncio
 import contextlib
-import json
+import itertools
 import logging
+import weakref
 from typing import TYPE_CHECKING, Any
 
+import orjson
 from websockets.asyncio.client import ClientConnection, connect
 from websockets.exceptions import ConnectionClosed, WebSocketException
 
@@ -18,6 +20,35 @@ if TYPE_CHECKING:
 
 _LOGGER = logging.getLogger(__name__)
 
+# Largest frame accepted from the server. State updates are well under this.
+_MAX_FRAME_SIZE = 64 * 1024
+
+# In-flight requests are tracked in a fixed ring of slots indexed by message id
+# (must be a power of two). Requests time out after 10s, so more than this many
+# in flight at once is unlikely; any extra spill over into a dict.
+_MAX_SLOTS = 64
+_SLOT_MASK = _MAX_SLOTS - 1
+
+# Pre-serialized envelopes for parameterless commands; only the id varies
+_METHOD_PREFIX: dict[str, str] = {
+    method: f'{{"jsonrpc":"2.0","method":"{method}","id":'
+    for method in ("play", "pause", "stop", "getState", "getSupportedMediaTypes")
+}
+
+
+def _build_request(
+    method: str, msg_id: int, params: dict[str, Any] | None
+) -> dict[str, Any]:
+    """Build a JSON-RPC request object."""
+    message: dict[str, Any] = {
+        "jsonrpc": "2.0",
+        "method": method,
+        "id": msg_id,
+    }
+    if params:
+        message["params"] = params
+    return message
+
 
 class ApiClientError(Exception):
     """General API client error."""
@@ -34,12 +65,21 @@ class RemoteMediaPlayerClient:
         """Initialize the client."""
         self._url = url
         self._websocket: ClientConnection | None = None
-        self._message_id = 0
-        self._state_callback: Callable[[dict[str, Any]], None] | None = None
-        self._error_callback: Callable[[str], None] | None = None
+        self._id_gen = itertools.count(1)
+        # Weak references, so the client doesn't keep its owner alive
+        self._state_callback: (
+            weakref.WeakMethod[Callable[[dict[str, Any]], None]] | None
+        ) = None
+        self._error_callback: weakref.WeakMethod[Callable[[str], None]] | None = None
         self._task: asyncio.Task | None = None
-        self._lock = asyncio.Lock()
-        self._response_futures: dict[int, asyncio.Future[dict[str, Any]]] = {}
+        # Callbacks are resolved when notified, so this never needs rebuilding
+        self._notification_handlers: dict[str, Callable[[dict[str, Any]], None]] = {
+            "stateChanged": self._notify_state,
+            "error": self._handle_error_notification,
+        }
+        self._slots: list[asyncio.Future[Any] | None] = [None] * _MAX_SLOTS
+        self._slot_ids: list[int] = [0] * _MAX_SLOTS
+        self._overflow_futures: dict[int, asyncio.Future[Any]] = {}
 
     async def connect(self) -> None:
         """Connect to the remote media player."""
@@ -51,69 +91,160 @@ class RemoteMediaPlayerClient:
                 self._url,
                 ping_timeout=30,
                 close_timeout=10,
+                # Frames are small, frequent JSON, where deflate costs more CPU
+                # than it saves; the size cap bounds memory per frame
+                compression=None,
+                max_size=_MAX_FRAME_SIZE,
             )
-            self._task = asyncio.create_task(self._listen())
         except (ConnectionError, WebSocketException) as err:
             msg = f"Failed to connect: {err}"
             raise ApiClientConnectionError(msg) from err
 
-    async def disconnect(self) -> None:
-        """Disconnect from the remote media player."""
+    async def probe(self) -> None:
+        """
+        Check that the server is reachable and answers JSON-RPC requests.
+
+        Uses a short-lived connection without starting the listener task.
+        """
+        msg_id = next(self._id_gen)
+        try:
+            async with (
+                connect(
+                    self._url,
+                    open_timeout=5,
+                    close_timeout=1,
+                    ping_interval=None,
+                    compression=None,
+                    max_size=_MAX_FRAME_SIZE,
+                ) as websocket,
+                asyncio.timeout(3),
+            ):
+                await websocket.send(
+                    f"{_METHOD_PREFIX['getSupportedMediaTypes']}{msg_id}}}"
+                )
+                # Skip any notifications sent ahead of our response
+                while True:
+                    data = orjson.loads(await websocket.recv())
+                    if data.get("id") == msg_id:
+                        break
+        except (OSError, WebSocketException) as err:
+            msg = f"Failed to connect: {err}"
+            raise ApiClientConnectionError(msg) from err
+        except (orjson.JSONDecodeError, AttributeError) as err:
+            msg = f"Unexpected response: {err}"
+            raise ApiClientConnectionError(msg) from err
+
+        if "result" not in data:
+            msg = "Server did not answer getSupportedMediaTypes"
+            raise ApiClientConnectionError(msg)
+
+    def start_listen(self) -> None:
+        """Start dispatching responses and notifications from the server."""
+        if self._task or not self._websocket:
+            return
+
+        self._task = asyncio.create_task(self._listen())
+
+    async def stop_listen(self) -> None:
+        """Stop the listener task, if running."""
         if self._task:
             self._task.cancel()
             with contextlib.suppress(asyncio.CancelledError):
                 await self._task
             self._task = None
 
+    async def disconnect(self) -> None:
+        """Disconnect from the remote media player."""
+        await self.stop_listen()
+
         if self._websocket:
             await self._websocket.close()
             self._websocket = None
 
         # Clear any pending futures
-        for future in self._response_futures.values():
-            if not future.done():
+        for future in (*self._slots, *self._overflow_futures.values()):
+            if future and not future.done():
                 future.cancel()
-        self._response_futures.clear()
+        self._slots = [None] * _MAX_SLOTS
+        self._overflow_futures.clear()
 
     def set_state_callback(self, callback: Callable[[dict[str, Any]], None]) -> None:
-        """Set callback for state updates."""
-        self._state_callback = callback
+        """Set callback for state updates. Must be a bound method."""
+        self._state_callback = weakref.WeakMethod(callback)
 
     def set_error_callback(self, callback: Callable[[str], None]) -> None:
-        """Set callback for errors."""
-        self._error_callback = callback
+        """Set callback for errors. Must be a bound method."""
+        self._error_callback = weakref.WeakMethod(callback)
+
+    def _notify_state(self, state: dict[str, Any]) -> None:
+        """Pass a state update to the state callback, if still alive."""
+        if self._state_callback and (callback := self._state_callback()):
+            callback(state)
+
+    def _notify_error(self, error: str) -> None:
+        """Pass an error to the error callback, if still alive."""
+        if self._error_callback and (callback := self._error_callback()):
+            callback(error)
+
+    def _handle_error_notification(self, params: dict[str, Any]) -> None:
+        """Handle an error notification from the server."""
+        self._notify_error(params["message"])
+
+    def _register_future(self, msg_id: int) -> asyncio.Future[Any]:
+        """Create and track the future for a request's response."""
+        future = asyncio.get_running_loop().create_future()
+        slot = msg_id & _SLOT_MASK
+        if self._slots[slot] is None:
+            self._slots[slot] = future
+            self._slot_ids[slot] = msg_id
+        else:
+            # Slot is still held by an older request
+            self._overflow_futures[msg_id] = future
+        return future
+
+    def _pop_future(self, msg_id: Any) -> asyncio.Future[Any] | None:
+        """Stop tracking and return the future for a request, if any."""
+        if not isinstance(msg_id, int):
+            return None
+
+        slot = msg_id & _SLOT_MASK
+        future = self._slots[slot]
+        if future is not None and self._slot_ids[slot] == msg_id:
+            self._slots[slot] = None
+            return future
+        return self._overflow_futures.pop(msg_id, None)
 
     def _handle_message(self, message: Data) -> None:
         """Handle a message from the WebSocket connection."""
         try:
-            if isinstance(message, bytes):
-                message = message.decode()
-
-            data = json.loads(message)
-
-            # Handle responses to requests
-            if "id" in data:
-                msg_id = data["id"]
-                if msg_id in self._response_futures:
-                    future = self._response_futures.pop(msg_id)
-                    if "error" in data:
-                        future.set_exception(ApiClientError(data["error"]["message"]))
-                    else:
-                        future.set_result(data.get("result", {}))
-                return
-
-            # Handle notifications
-            if "method" in data:
-                if data["method"] == "stateChanged" and self._state_callback:
-                    self._state_callback(data["params"])
-                elif data["method"] == "error" and self._error_callback:
-                    self._error_callback(data["params"]["message"])
-        except json.JSONDecodeError:
+            # orjson parses str and bytes frames alike, no decode step needed
+            data = orjson.loads(message)
+
+            # Batch responses arrive as an array of individual responses
+            for item in data if isinstance(data, list) else (data,):
+                self._handle_payload(item)
+        except orjson.JSONDecodeError:
             _LOGGER.exception("Failed to decode message")
         except KeyError:
             _LOGGER.exception("Invalid message format")
-        except UnicodeDecodeError:
-            _LOGGER.exception("Failed to decode binary message")
+
+    def _handle_payload(self, data: dict[str, Any]) -> None:
+        """Handle a single decoded response or notification."""
+        # Handle responses to requests
+        if "id" in data:
+            msg_id = data["id"]
+            future = self._pop_future(msg_id)
+            # The caller may have been cancelled before the response arrived
+            if future and not future.done():
+                if "error" in data:
+                    future.set_exception(ApiClientError(data["error"]["message"]))
+                else:
+                    future.set_result(data.get("result"))
+            return
+
+        # Handle notifications
+        if handler := self._notification_handlers.get(data.get("method")):
+            handler(data.get("params") or {})
 
     async def _listen(self) -> None:
         """Listen for messages from the server."""
@@ -124,12 +255,10 @@ class RemoteMediaPlayerClient:
             async for message in self._websocket:
                 self._handle_message(message)
         except ConnectionClosed:
-            if self._error_callback:
-                self._error_callback("Connection closed")
+            self._notify_error("Connection closed")
         except Exception as err:
             _LOGGER.exception("WebSocket error")
-            if self._error_callback:
-                self._error_callback(str(err))
+            self._notify_error(str(err))
 
     async def _send_command(
         self, method: str, params: dict[str, Any] | None = None
@@ -139,59 +268,126 @@ class RemoteMediaPlayerClient:
             msg = "Not connected"
             raise ApiClientConnectionError(msg)
 
-        async with self._lock:
-            self._message_id += 1
-            msg_id = self._message_id
-            message = {
-                "jsonrpc": "2.0",
-                "method": method,
-                "id": msg_id,
-            }
-            if params:
-                message["params"] = params
-
-            # Create a future for the response
-            future = asyncio.get_running_loop().create_future()
-            self._response_futures[msg_id] = future
-
-            try:
-                await self._websocket.send(json.dumps(message))
-                return await asyncio.wait_for(future, timeout=10.0)
-            except TimeoutError as err:
-                self._response_futures.pop(msg_id, None)
-                msg = f"Command timed out: {method}"
-                raise ApiClientConnectionError(msg) from err
-            except (ConnectionError, WebSocketException) as err:
-                self._response_futures.pop(msg_id, None)
-                msg = f"Command failed: {err}"
-                raise ApiClientConnectionError(msg) from err
+        # Ids come from a counter, so no lock is needed and any number of
+        # commands can await their responses at once. Send order across
+        # concurrent commands isn't guaranteed, but JSON-RPC matches by id.
+        msg_id = next(self._id_gen)
+        future = self._register_future(msg_id)
+
+        if not params and method in _METHOD_PREFIX:
+            payload = f"{_METHOD_PREFIX[method]}{msg_id}}}"
+        else:
+            # Decode to send a text frame, which servers expect for JSON-RPC
+            payload = orjson.dumps(_build_request(method, msg_id, params)).decode()
+
+        try:
+            await self._websocket.send(payload)
+            return await asyncio.wait_for(future, timeout=10.0)
+        except asyncio.CancelledError:
+            self._pop_future(msg_id)
+            raise
+        except TimeoutError as err:
+            self._pop_future(msg_id)
+            msg = f"Command timed out: {method}"
+            raise ApiClientConnectionError(msg) from err
+        except (ConnectionError, WebSocketException) as err:
+            self._pop_future(msg_id)
+            msg = f"Command failed: {err}"
+            raise ApiClientConnectionError(msg) from err
+
+    async def _send_batch(
+        self,
+        requests: list[tuple[str, dict[str, Any] | None]],
+        timeout: float = 10.0,  # noqa: ASYNC109
+    ) -> list[Any]:
+        """Send several commands as one JSON-RPC batch, in a single frame."""
+        if not self._websocket:
+            msg = "Not connected"
+            raise ApiClientConnectionError(msg)
+
+        msg_ids: list[int] = []
+        futures: list[asyncio.Future[Any]] = []
+        batch: list[dict[str, Any]] = []
+        for method, params in requests:
+            msg_id = next(self._id_gen)
+            future = self._register_future(msg_id)
+            msg_ids.append(msg_id)
+            futures.append(future)
+            batch.append(_build_request(method, msg_id, params))
+
+        try:
+            await self._websocket.send(orjson.dumps(batch).decode())
+            # Wait on the bare futures rather than a gather, so a timeout or a
+            # cancelled caller never leaves an unretrieved gather exception
+            _, pending = await asyncio.wait(futures, timeout=timeout)
+        except asyncio.CancelledError:
+            self._discard_batch(msg_ids, futures)
+            raise
+        except (ConnectionError, WebSocketException) as err:
+            self._discard_batch(msg_ids, futures)
+            msg = f"Batch failed: {err}"
+            raise ApiClientConnectionError(msg) from err
+
+        if pending:
+            self._discard_batch(msg_ids, futures)
+            methods = ", ".join(method for method, _ in requests)
+            msg = f"Batch timed out: {methods}"
+            raise ApiClientConnectionError(msg)
+
+        # Retrieve every error before raising the first
+        for error in [future.exception() for future in futures]:
+            if error:
+                raise error
+        return [future.result() for future in futures]
+
+    def _discard_batch(
+        self, msg_ids: list[int], futures: list[asyncio.Future[Any]]
+    ) -> None:
+        """Stop tracking an abandoned batch, retrieving any errors it got."""
+        for msg_id in msg_ids:
+            self._pop_future(msg_id)
+        for future in futures:
+            if not future.done():
+                future.cancel()
+            elif not future.cancelled():
+                future.exception()
+
+    async def _send_control_command(
+        self, method: str, params: dict[str, Any] | None = None
+    ) -> None:
+        """Send a player control command."""
+        result = await self._send_command(method, params)
+        # Servers may answer with the new state instead of `true` and a
+        # separate stateChanged notification
+        if isinstance(result, dict) and "state" in result:
+            self._notify_state(result)
 
     async def play(self) -> None:
         """Send play command."""
-        await self._send_command("play")
+        await self._send_control_command("play")
 
     async def pause(self) -> None:
         """Send pause command."""
-        await self._send_command("pause")
+        await self._send_control_command("pause")
 
     async def stop(self) -> None:
         """Send stop command."""
-        await self._send_command("stop")
+        await self._send_control_command("stop")
 
     async def load(self, url: str, options: dict[str, Any] | None = None) -> None:
         """Load media from URL."""
         params: dict[str, Any] = {"url": url}
         if options:
             params["options"] = options
-        await self._send_command("load", params)
+        await self._send_control_command("load", params)
 
     async def set_volume(self, level: float) -> None:
         """Set volume level (0.0 to 1.0)."""
-        await self._send_command("setVolume", {"level": level})
+        await self._send_control_command("setVolume", {"level": level})
 
     async def seek(self, position: float) -> None:
         """Seek to position in seconds."""
-        await self._send_command("seek", {"position": position})
+        await self._send_control_command("seek", {"position": position})
 
     async def get_state(self) -> dict[str, Any]:
         """Get current player state."""
@@ -200,3 +396,13 @@ class RemoteMediaPlayerClient:
     async def get_supported_media_types(self) -> list[str]:
         """Get list of supported media types from the server."""
         return await self._send_command("getSupportedMediaTypes")
+
+    async def get_state_and_supported_media_types(
+        self,
+        timeout: float = 10.0,  # noqa: ASYNC109
+    ) -> tuple[dict[str, Any], list[str]]:
+        """Get the player state and supported media types in one round trip."""
+        state, media_types = await self._send_batch(
+            [("getState", None), ("getSupportedMediaTypes", None)], timeout
+        )
+        return state, media_types
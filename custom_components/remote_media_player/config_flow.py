@@ -73,9 +73,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 client = RemoteMediaPlayerClient(
                     url=user_input[CONF_URL],
                 )
-                await client.connect()
-                await client.get_state()  # Test the connection
-                await client.disconnect()
+                await client.probe()
 
                 return self.async_create_entry(
                     title=user_input[CONF_NAME],
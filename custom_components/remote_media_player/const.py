@@ -8,5 +8,3 @@ DOMAIN = "remote_media_player"
 DEFAULT_NAME = "Remote Media Player"
 
 CONF_URL = "url"
-
-ATTRIBUTION = "Data provided by http://jsonplaceholder.typicode.com/"
@@ -2,10 +2,11 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from typing import TYPE_CHECKING, Any
 
-from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.core import callback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
 from .api import ApiClientConnectionError, RemoteMediaPlayerClient
@@ -26,6 +27,7 @@ class RemoteMediaPlayerCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         super().__init__(
             hass=hass,
             logger=_LOGGER,
+            config_entry=entry,
             name=DOMAIN,
             update_interval=None,  # We'll get updates via WebSocket
         )
@@ -35,15 +37,31 @@ class RemoteMediaPlayerCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         )
         self.client.set_state_callback(self._handle_state_update)
         self.client.set_error_callback(self._handle_error)
+        # Filled during setup, so the entity doesn't need its own round trip.
+        # Reloading rebuilds the coordinator, so each reload fetches it anew.
+        self._supported_media_types_cache: tuple[str, ...] | None = None
+        self._initial_state: dict[str, Any] | None = None
+        self.media: dict[str, Any] = {}
 
     async def _async_update_data(self) -> dict[str, Any]:
         """Update data via library."""
+        # The first refresh uses the state fetched alongside the setup batch
+        if self._initial_state is not None:
+            state, self._initial_state = self._initial_state, None
+            return state
+
         try:
             return await self.client.get_state()
         except ApiClientConnectionError as err:
             msg = f"Error communicating with API: {err}"
             raise UpdateFailed(msg) from err
 
+    @callback
+    def async_update_listeners(self) -> None:
+        """Cache the media section of the new data, then notify listeners."""
+        self.media = (self.data or {}).get("media") or {}
+        super().async_update_listeners()
+
     def _handle_state_update(self, state: dict[str, Any]) -> None:
         """Handle state update from WebSocket."""
         self.async_set_updated_data(state)
@@ -53,11 +71,41 @@ class RemoteMediaPlayerCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         _LOGGER.error("Error from media player: %s", error)
         self.last_update_success = False
 
-    async def async_setup(self) -> None:
-        """Set up the coordinator."""
+    async def _async_setup(self) -> None:
+        """Connect to the media player ahead of the first refresh."""
         try:
             await self.client.connect()
-            await self.async_refresh()
         except ApiClientConnectionError as err:
             msg = f"Failed to connect to media player: {err}"
-            raise ConfigEntryNotReady(msg) from err
+            raise UpdateFailed(msg) from err
+        self.client.start_listen()
+
+        # Fetch the state and supported media types together, overlapping the
+        # two round trips without relying on server batch support. Whichever
+        # request fails is fetched again on its own later.
+        state, media_types = await asyncio.gather(
+            self.client.get_state(),
+            self.client.get_supported_media_types(),
+            return_exceptions=True,
+        )
+        if isinstance(state, BaseException):
+            _LOGGER.debug("Initial state request failed: %s", state)
+        else:
+            self._initial_state = state
+        if isinstance(media_types, BaseException):
+            _LOGGER.debug("Supported media types request failed: %s", media_types)
+        else:
+            self._supported_media_types_cache = tuple(media_types)
+
+    async def async_get_supported_media_types(self) -> tuple[str, ...]:
+        """Get the media types supported by the server, cached per coordinator."""
+        if self._supported_media_types_cache is None:
+            self._supported_media_types_cache = tuple(
+                await self.client.get_supported_media_types()
+            )
+        return self._supported_media_types_cache
+
+    async def async_disconnect(self) -> None:
+        """Disconnect from the media player and drop cached server details."""
+        self._supported_media_types_cache = None
+        await self.client.disconnect()
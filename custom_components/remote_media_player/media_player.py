@@ -15,17 +15,20 @@ from homeassistant.components.media_player.const import (
     MediaType,
 )
 from homeassistant.const import CONF_NAME
+from homeassistant.core import callback
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
+from .coordinator import RemoteMediaPlayerCoordinator
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+
     from homeassistant.config_entries import ConfigEntry
     from homeassistant.core import HomeAssistant
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-    from .coordinator import RemoteMediaPlayerCoordinator
-
 _LOGGER = logging.getLogger(__name__)
 
 # Features our media player supports
@@ -53,6 +56,17 @@ MEDIA_TYPE_MAP = {
     "game": MediaType.GAME,
 }
 
+# Reverse of MEDIA_TYPE_MAP, for converting HA media types back to server types
+_REVERSE_MEDIA_TYPE_MAP: dict[str, str] = {v: k for k, v in MEDIA_TYPE_MAP.items()}
+
+# Map of server player states to Home Assistant player states
+_STATE_MAP: dict[str, MediaPlayerState] = {
+    "playing": MediaPlayerState.PLAYING,
+    "paused": MediaPlayerState.PAUSED,
+    "idle": MediaPlayerState.IDLE,
+    "error": MediaPlayerState.OFF,  # Use OFF instead of PROBLEM for error state
+}
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -64,7 +78,9 @@ async def async_setup_entry(
     async_add_entities([RemoteMediaPlayer(coordinator, entry)])
 
 
-class RemoteMediaPlayer(MediaPlayerEntity):
+class RemoteMediaPlayer(
+    CoordinatorEntity[RemoteMediaPlayerCoordinator], MediaPlayerEntity
+):
     """Representation of a Remote Media Player."""
 
     _attr_device_class = MediaPlayerDeviceClass.TV
@@ -74,124 +90,60 @@ class RemoteMediaPlayer(MediaPlayerEntity):
         self, coordinator: RemoteMediaPlayerCoordinator, entry: ConfigEntry
     ) -> None:
         """Initialize the media player."""
+        super().__init__(coordinator)
         self._attr_unique_id = entry.entry_id
         self._attr_name = entry.data[CONF_NAME]
-        self.coordinator = coordinator
-        self._supported_media_types: list[str] = []
+        self._supported_media_types: frozenset[str] = frozenset()
+        self._cached_supported_media_types: list[str] = []
+        self._update_attrs()
 
     async def async_added_to_hass(self) -> None:
         """Run when entity is added to hass."""
         await super().async_added_to_hass()
         # Get supported media types from server
         try:
-            self._supported_media_types = (
-                await self.coordinator.client.get_supported_media_types()
+            self._set_supported_media_types(
+                await self.coordinator.async_get_supported_media_types()
             )
         except Exception as err:  # noqa: BLE001
             _LOGGER.warning("Failed to get supported media types: %s", err)
-            self._supported_media_types = ["url"]  # Fallback to basic URL support
-
-    @property
-    @override
-    def available(self) -> bool:
-        """Return if the media player is available."""
-        return self.coordinator.last_update_success
-
-    @property
-    @override
-    def state(self) -> MediaPlayerState | None:
-        """Return the state of the media player."""
-        if not self.coordinator.data:
-            return None
-
-        state = self.coordinator.data.get("state")
-        if state == "playing":
-            return MediaPlayerState.PLAYING
-        if state == "paused":
-            return MediaPlayerState.PAUSED
-        if state == "idle":
-            return MediaPlayerState.IDLE
-        if state == "error":
-            return MediaPlayerState.OFF  # Use OFF instead of PROBLEM for error state
-        return None
-
-    @property
-    @override
-    def media_position(self) -> float | None:
-        """Return the position of current playing media in seconds."""
-        if not self.coordinator.data:
-            return None
-
-        media = self.coordinator.data.get("media", {})
-        return media.get("position")
-
-    @property
-    @override
-    def media_duration(self) -> float | None:
-        """Return the duration of current playing media in seconds."""
-        if not self.coordinator.data:
-            return None
-
-        media = self.coordinator.data.get("media", {})
-        return media.get("duration")
-
-    @property
-    @override
-    def media_title(self) -> str | None:
-        """Return the title of current playing media."""
-        if not self.coordinator.data:
-            return None
-
-        media = self.coordinator.data.get("media", {})
-        return media.get("title")
-
-    @property
-    @override
-    def media_artist(self) -> str | None:
-        """Return the artist of current playing media."""
-        if not self.coordinator.data:
-            return None
-
-        media = self.coordinator.data.get("media", {})
-        return media.get("artist")
-
-    @property
-    @override
-    def media_album_name(self) -> str | None:
-        """Return the album of current playing media."""
-        if not self.coordinator.data:
-            return None
-
-        media = self.coordinator.data.get("media", {})
-        return media.get("album")
-
-    @property
-    @override
-    def media_image_url(self) -> str | None:
-        """Return the image URL of current playing media."""
-        if not self.coordinator.data:
-            return None
-
-        media = self.coordinator.data.get("media", {})
-        return media.get("thumbnail")
+            self._set_supported_media_types({"url"})  # Fallback to basic URL support
+
+    def _set_supported_media_types(self, media_types: Iterable[str]) -> None:
+        """Store the server media types along with their HA equivalents."""
+        media_types = tuple(media_types)
+        # The frozenset is for membership checks, the list keeps server order
+        self._supported_media_types = frozenset(media_types)
+        self._cached_supported_media_types = [
+            MEDIA_TYPE_MAP[t] for t in media_types if t in MEDIA_TYPE_MAP
+        ]
 
-    @property
+    @callback
+    def _update_attrs(self) -> None:
+        """Cache entity attributes from the latest coordinator data."""
+        data = self.coordinator.data or {}
+        media = self.coordinator.media
+
+        self._attr_state = _STATE_MAP.get(data.get("state"))
+        self._attr_media_position = media.get("position")
+        self._attr_media_duration = media.get("duration")
+        self._attr_media_title = media.get("title")
+        self._attr_media_artist = media.get("artist")
+        self._attr_media_album_name = media.get("album")
+        self._attr_media_image_url = media.get("thumbnail")
+        self._attr_volume_level = data.get("volume")
+
+    @callback
     @override
-    def volume_level(self) -> float | None:
-        """Return the volume level."""
-        if not self.coordinator.data:
-            return None
-
-        return self.coordinator.data.get("volume")
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        self._update_attrs()
+        self.async_write_ha_state()
 
     @property
     def supported_media_types(self) -> list[str]:
         """Return the list of supported media types."""
-        return [
-            MEDIA_TYPE_MAP[t]
-            for t in self._supported_media_types
-            if t in MEDIA_TYPE_MAP
-        ]
+        return self._cached_supported_media_types
 
     @override
     async def async_play_media(
@@ -199,8 +151,8 @@ class RemoteMediaPlayer(MediaPlayerEntity):
     ) -> None:
         """Play a piece of media."""
         # Convert HA media type back to server media type
-        server_media_type = next(
-            (k for k, v in MEDIA_TYPE_MAP.items() if v == media_type),
+        server_media_type = _REVERSE_MEDIA_TYPE_MAP.get(
+            media_type,
             "url",  # Default to URL if type not found
         )
 
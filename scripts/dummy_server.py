@@ -1,218 +1,477 @@
 #!/usr/bin/env python3
-"""Dummy WebSocket server for testing the Remote Media Player integration."""
+"""
+Dummy WebSocket server for testing the Remote Media Player integration.
+
+Speaks JSON-RPC over JSON by default. Clients that offer the `msgpack-rpc`
+subprotocol get the same messages framed as MessagePack instead.
+"""
 
 import asyncio
-import json
+import functools
 import logging
-from datetime import UTC, datetime
+import time
+from collections.abc import Awaitable, Callable, Sequence
 from typing import Any
 
+import msgspec
 import websockets
 from websockets.asyncio.server import ServerConnection
+from websockets.typing import Subprotocol
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("dummy_server")
 
 
+SUPPORTED_MEDIA_TYPES = ["video", "music", "url"]
+
+# Clients may negotiate MessagePack framing; everything else speaks JSON
+MSGPACK_SUBPROTOCOL = Subprotocol("msgpack-rpc")
+JSON_SUBPROTOCOL = Subprotocol("json-rpc")
+
+# Pre-encoded JSON responses whose only varying part is the request id
+_SUPPORTED_PREFIX = (
+    b'{"jsonrpc":"2.0","result":'
+    + msgspec.json.encode(SUPPORTED_MEDIA_TYPES)
+    + b',"id":'
+)
+_SUFFIX = b"}"
+
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+
+
+@functools.lru_cache(maxsize=64)
+def _not_found_prefix(method: str) -> bytes:
+    """Pre-encode the "Method not found" error for a method, up to the id."""
+    message = msgspec.json.encode(f"Method {method} not found")
+    return b'{"jsonrpc":"2.0","error":{"code":%d,"message":%b},"id":' % (
+        METHOD_NOT_FOUND,
+        message,
+    )
+
+
+class Request(msgspec.Struct):
+    """An incoming JSON-RPC request."""
+
+    method: str = ""
+    id: int | str | None = None
+    params: dict[str, Any] = {}
+
+
+class RpcResult(msgspec.Struct, kw_only=True):
+    """A successful JSON-RPC response."""
+
+    jsonrpc: str = "2.0"
+    result: Any
+    id: Any
+
+
+class RpcErrorDetail(msgspec.Struct):
+    """The error member of a JSON-RPC error response."""
+
+    code: int
+    message: str
+
+
+class RpcError(msgspec.Struct, kw_only=True):
+    """A JSON-RPC error response."""
+
+    jsonrpc: str = "2.0"
+    error: RpcErrorDetail
+    id: Any
+
+
+class Codec:
+    """Encodes and decodes JSON-RPC messages for one wire format."""
+
+    def __init__(
+        self,
+        encode: Callable[[Any], bytes],
+        decode: Callable[[bytes], Request | list[Request]],
+        *,
+        text: bool = False,
+    ) -> None:
+        """Initialize the codec."""
+        self.encode = encode
+        self.decode = decode
+        self.text = text
+
+    async def send(self, websocket: ServerConnection, message: bytes) -> None:
+        """Send an encoded message in this format's frame type."""
+        # websockets sends the UTF-8 bytes as a text frame as is, no transcoding
+        await websocket.send(message, text=self.text)
+
+    def result(self, req_id: Any, result: Any) -> bytes:
+        """Encode a successful response."""
+        return self.encode(RpcResult(result=result, id=req_id))
+
+    def supported_media_types(self, req_id: Any) -> bytes:
+        """Encode the getSupportedMediaTypes response."""
+        return self.result(req_id, SUPPORTED_MEDIA_TYPES)
+
+    def error(self, req_id: Any, code: int, message: str) -> bytes:
+        """Encode an error response."""
+        return self.encode(
+            RpcError(error=RpcErrorDetail(code=code, message=message), id=req_id)
+        )
+
+    def method_not_found(self, req_id: Any, method: str) -> bytes:
+        """Encode a "Method not found" error response."""
+        return self.error(req_id, METHOD_NOT_FOUND, f"Method {method} not found")
+
+
+class JsonCodec(Codec):
+    """JSON wire format, with pre-encoded templates for static responses."""
+
+    def __init__(self) -> None:
+        """Initialize the codec."""
+        super().__init__(
+            msgspec.json.Encoder().encode,
+            msgspec.json.Decoder(Request | list[Request]).decode,
+            text=True,
+        )
+
+    def supported_media_types(self, req_id: Any) -> bytes:
+        """Encode the getSupportedMediaTypes response."""
+        return _SUPPORTED_PREFIX + msgspec.json.encode(req_id) + _SUFFIX
+
+    def method_not_found(self, req_id: Any, method: str) -> bytes:
+        """Encode a "Method not found" error response."""
+        return _not_found_prefix(method) + msgspec.json.encode(req_id) + _SUFFIX
+
+
+JSON_CODEC = JsonCodec()
+MSGPACK_CODEC = Codec(
+    msgspec.msgpack.Encoder().encode,
+    msgspec.msgpack.Decoder(Request | list[Request]).decode,
+)
+
+
+def _select_subprotocol(
+    _: ServerConnection, subprotocols: Sequence[Subprotocol]
+) -> Subprotocol | None:
+    """Pick MessagePack if offered, falling back to JSON."""
+    if MSGPACK_SUBPROTOCOL in subprotocols:
+        return MSGPACK_SUBPROTOCOL
+    if JSON_SUBPROTOCOL in subprotocols:
+        return JSON_SUBPROTOCOL
+    # Clients that don't negotiate get plain JSON-RPC
+    return None
+
+
 class DummyMediaPlayer:
     """Simulates a media player with basic state."""
 
+    # One player is created per connection, so keep instances small
+    __slots__ = (
+        "_media",
+        "album",
+        "artist",
+        "duration",
+        "last_update",
+        "lock",
+        "media_type",
+        "media_url",
+        "position",
+        "state",
+        "title",
+        "volume",
+    )
+
     def __init__(self) -> None:
         """Initialize the dummy player."""
         self.state = "idle"
         self.position = 0.0
         self.duration = 300.0  # 5 minutes
         self.volume = 0.5
-        self.media_url = None
-        self.media_type = None
+        # Only plain str/float values go into the state, keeping the encoders on
+        # their fast paths: "" rather than None when unset, floats never ints
+        self.media_url = ""
+        self.media_type = ""
         self.title = "Test Media"
         self.artist = "Test Artist"
         self.album = "Test Album"
-        self.last_update = datetime.now(tz=UTC)
+        self.last_update = time.monotonic()
+        # Serializes state-changing requests, which may be handled concurrently
+        self.lock = asyncio.Lock()
+        # Built once; get_state only refreshes the fields that can change
+        self._media: dict[str, Any] = {
+            "url": self.media_url,
+            "media_type": self.media_type,
+            "position": self.position,
+            "duration": self.duration,
+            "title": self.title,
+            "artist": self.artist,
+            "album": self.album,
+            "thumbnail": "http://example.com/thumb.jpg",
+        }
 
-    def get_state(self) -> dict[str, Any]:
-        """Get the current state."""
-        now = datetime.now(tz=UTC)
+    def refresh_position(self) -> None:
+        """Advance the position by the time played since the last update."""
+        now = time.monotonic()
         if self.state == "playing":
-            # Update position based on elapsed time
-            elapsed = (now - self.last_update).total_seconds()
+            elapsed = now - self.last_update
             self.position = min(self.position + elapsed, self.duration)
 
         self.last_update = now
 
+    def set_position(self, position: float) -> None:
+        """Jump to a position, with no elapsed time to account for."""
+        self.position = float(position)
+        self.last_update = time.monotonic()
+
+    def snapshot(self) -> dict[str, Any]:
+        """Get the state as of the last position update."""
+        media = self._media
+        media["url"] = self.media_url
+        media["media_type"] = self.media_type
+        media["position"] = self.position
+
         return {
             "state": self.state,
-            "media": {
-                "url": self.media_url,
-                "media_type": self.media_type,
-                "position": self.position,
-                "duration": self.duration,
-                "title": self.title,
-                "artist": self.artist,
-                "album": self.album,
-                "thumbnail": "http://example.com/thumb.jpg",
-            },
+            "media": media,
             "volume": self.volume,
         }
 
+    def get_state(self) -> dict[str, Any]:
+        """Get the current state."""
+        self.refresh_position()
+        return self.snapshot()
+
+
+async def _send_state_result(
+    player: DummyMediaPlayer, websocket: ServerConnection, codec: Codec, req_id: Any
+) -> None:
+    """Answer a state-changing request with the new state."""
+    await codec.send(websocket, codec.result(req_id, player.snapshot()))
+
+
+async def _handle_get_state(
+    player: DummyMediaPlayer,
+    websocket: ServerConnection,
+    codec: Codec,
+    req_id: Any,
+    _params: dict[str, Any],
+) -> None:
+    """Handle getState."""
+    await codec.send(websocket, codec.result(req_id, player.get_state()))
+
+
+async def _handle_get_supported_media_types(
+    _player: DummyMediaPlayer,
+    websocket: ServerConnection,
+    codec: Codec,
+    req_id: Any,
+    _params: dict[str, Any],
+) -> None:
+    """Handle getSupportedMediaTypes."""
+    await codec.send(websocket, codec.supported_media_types(req_id))
+
+
+async def _handle_play(
+    player: DummyMediaPlayer,
+    websocket: ServerConnection,
+    codec: Codec,
+    req_id: Any,
+    _params: dict[str, Any],
+) -> None:
+    """Handle play."""
+    # Bring the position up to date before the state change (a no-op while
+    # paused), so time spent paused isn't counted as played
+    player.refresh_position()
+    player.state = "playing"
+    await _send_state_result(player, websocket, codec, req_id)
+
+
+async def _handle_pause(
+    player: DummyMediaPlayer,
+    websocket: ServerConnection,
+    codec: Codec,
+    req_id: Any,
+    _params: dict[str, Any],
+) -> None:
+    """Handle pause."""
+    player.refresh_position()
+    player.state = "paused"
+    await _send_state_result(player, websocket, codec, req_id)
+
+
+async def _handle_stop(
+    player: DummyMediaPlayer,
+    websocket: ServerConnection,
+    codec: Codec,
+    req_id: Any,
+    _params: dict[str, Any],
+) -> None:
+    """Handle stop."""
+    # The resulting position is known, so there's no elapsed time to work out
+    player.state = "idle"
+    player.set_position(0)
+    await _send_state_result(player, websocket, codec, req_id)
+
+
+async def _handle_set_volume(
+    player: DummyMediaPlayer,
+    websocket: ServerConnection,
+    codec: Codec,
+    req_id: Any,
+    params: dict[str, Any],
+) -> None:
+    """Handle setVolume."""
+    level = float(params["level"])
+    player.refresh_position()
+    player.volume = level
+    await _send_state_result(player, websocket, codec, req_id)
+
+
+async def _handle_load(
+    player: DummyMediaPlayer,
+    websocket: ServerConnection,
+    codec: Codec,
+    req_id: Any,
+    params: dict[str, Any],
+) -> None:
+    """Handle load."""
+    # Read every param before changing anything, so bad params leave the
+    # player untouched
+    options = params.get("options", {})
+    url = params["url"]
+    media_type = options.get("media_type", "url")
+    start_position = float(options.get("startPosition", 0))
+    player.media_url = url
+    player.media_type = media_type
+    player.set_position(start_position)
+    player.state = "playing" if options.get("autoplay", True) else "paused"
+    await _send_state_result(player, websocket, codec, req_id)
+
+
+_Handler = Callable[
+    [DummyMediaPlayer, ServerConnection, Codec, Any, dict[str, Any]],
+    Awaitable[None],
+]
+
+# Methods that change player state, and so must not run concurrently
+_STATE_CHANGING_METHODS = frozenset({"play", "pause", "stop", "setVolume", "load"})
+
+# Most requests from a single client that are handled at once
+_MAX_IN_FLIGHT = 32
+
+_HANDLERS: dict[str, _Handler] = {
+    "getState": _handle_get_state,
+    "getSupportedMediaTypes": _handle_get_supported_media_types,
+    "play": _handle_play,
+    "pause": _handle_pause,
+    "stop": _handle_stop,
+    "setVolume": _handle_set_volume,
+    "load": _handle_load,
+}
+
+
+async def _handle_request(
+    player: DummyMediaPlayer,
+    websocket: ServerConnection,
+    codec: Codec,
+    request: Request,
+) -> None:
+    """Handle a single JSON-RPC request."""
+    # Notifications (no id) get no response
+    if not request.method or request.id is None:
+        return
+
+    handler = _HANDLERS.get(request.method)
+    if handler is None:
+        await codec.send(websocket, codec.method_not_found(request.id, request.method))
+        return
+
+    # Handlers raise on missing or mistyped params before sending anything, so
+    # they're answered here rather than failing the whole connection
+    try:
+        if request.method in _STATE_CHANGING_METHODS:
+            async with player.lock:
+                await handler(player, websocket, codec, request.id, request.params)
+        else:
+            await handler(player, websocket, codec, request.id, request.params)
+    except (AttributeError, KeyError, TypeError, ValueError):
+        logger.exception("Invalid params for %s", request.method)
+        await codec.send(
+            websocket, codec.error(request.id, INVALID_PARAMS, "Invalid params")
+        )
+
+
+async def _serve_one(
+    player: DummyMediaPlayer,
+    websocket: ServerConnection,
+    codec: Codec,
+    message: bytes,
+) -> None:
+    """Answer the request(s) in one message."""
+    try:
+        payload = codec.decode(message)
+    # Also raised for well-formed messages that aren't valid requests
+    except msgspec.DecodeError:
+        logger.exception("Invalid message received")
+        return
+
+    # Requests in a batch are answered individually, each in its own frame;
+    # clients match responses by id either way
+    for request in payload if isinstance(payload, list) else [payload]:
+        await _handle_request(player, websocket, codec, request)
+
 
 async def handle_client(websocket: ServerConnection) -> None:
     """Handle a client connection."""
     player = DummyMediaPlayer()
-    logger.info("Client connected")
+    codec = (
+        MSGPACK_CODEC if websocket.subprotocol == MSGPACK_SUBPROTOCOL else JSON_CODEC
+    )
+    logger.info("Client connected (%s)", websocket.subprotocol or "json")
+
+    in_flight = asyncio.Semaphore(_MAX_IN_FLIGHT)
+
+    async def serve(message: bytes) -> None:
+        try:
+            await _serve_one(player, websocket, codec, message)
+        finally:
+            in_flight.release()
 
+    # Messages are handled concurrently, so pipelined requests overlap
     try:
-        while True:
-            try:
-                message = await websocket.recv()
-                data = json.loads(message)
-
-                if "method" not in data or "id" not in data:
-                    continue
-
-                method = data["method"]
-                params = data.get("params", {})
-
-                if method == "getState":
-                    await websocket.send(
-                        json.dumps(
-                            {
-                                "jsonrpc": "2.0",
-                                "result": player.get_state(),
-                                "id": data["id"],
-                            }
-                        )
-                    )
-
-                elif method == "getSupportedMediaTypes":
-                    await websocket.send(
-                        json.dumps(
-                            {
-                                "jsonrpc": "2.0",
-                                "result": ["video", "music", "url"],
-                                "id": data["id"],
-                            }
-                        )
-                    )
-
-                elif method == "play":
-                    player.state = "playing"
-                    await websocket.send(
-                        json.dumps({"jsonrpc": "2.0", "result": True, "id": data["id"]})
-                    )
-                    # Send state update
-                    await websocket.send(
-                        json.dumps(
-                            {
-                                "jsonrpc": "2.0",
-                                "method": "stateChanged",
-                                "params": player.get_state(),
-                            }
-                        )
-                    )
-
-                elif method == "pause":
-                    player.state = "paused"
-                    await websocket.send(
-                        json.dumps({"jsonrpc": "2.0", "result": True, "id": data["id"]})
-                    )
-                    # Send state update
-                    await websocket.send(
-                        json.dumps(
-                            {
-                                "jsonrpc": "2.0",
-                                "method": "stateChanged",
-                                "params": player.get_state(),
-                            }
-                        )
-                    )
-
-                elif method == "stop":
-                    player.state = "idle"
-                    player.position = 0
-                    await websocket.send(
-                        json.dumps({"jsonrpc": "2.0", "result": True, "id": data["id"]})
-                    )
-                    # Send state update
-                    await websocket.send(
-                        json.dumps(
-                            {
-                                "jsonrpc": "2.0",
-                                "method": "stateChanged",
-                                "params": player.get_state(),
-                            }
-                        )
-                    )
-
-                elif method == "setVolume":
-                    player.volume = params["level"]
-                    await websocket.send(
-                        json.dumps({"jsonrpc": "2.0", "result": True, "id": data["id"]})
-                    )
-                    # Send state update
-                    await websocket.send(
-                        json.dumps(
-                            {
-                                "jsonrpc": "2.0",
-                                "method": "stateChanged",
-                                "params": player.get_state(),
-                            }
-                        )
-                    )
-
-                elif method == "load":
-                    player.media_url = params["url"]
-                    player.media_type = params.get("options", {}).get(
-                        "media_type", "url"
-                    )
-                    player.position = params.get("options", {}).get("startPosition", 0)
-                    player.state = (
-                        "playing"
-                        if params.get("options", {}).get("autoplay", True)
-                        else "paused"
-                    )
-                    await websocket.send(
-                        json.dumps({"jsonrpc": "2.0", "result": True, "id": data["id"]})
-                    )
-                    # Send state update
-                    await websocket.send(
-                        json.dumps(
-                            {
-                                "jsonrpc": "2.0",
-                                "method": "stateChanged",
-                                "params": player.get_state(),
-                            }
-                        )
-                    )
-
-                else:
-                    await websocket.send(
-                        json.dumps(
-                            {
-                                "jsonrpc": "2.0",
-                                "error": {
-                                    "code": -32601,
-                                    "message": f"Method {method} not found",
-                                },
-                                "id": data["id"],
-                            }
-                        )
-                    )
-
-            except json.JSONDecodeError:
-                logger.exception("Invalid JSON received")
-                continue
-
-    except websockets.ConnectionClosed:
+        async with asyncio.TaskGroup() as tg:
+            while True:
+                # Take text frames as raw bytes too; the decoders parse UTF-8
+                # directly, so decoding to str first would be wasted work
+                # (needs websockets >= 13)
+                message = await websocket.recv(decode=False)
+                await in_flight.acquire()
+                tg.create_task(serve(message))
+    except* websockets.ConnectionClosed:
         logger.info("Client disconnected")
 
 
 async def main() -> None:
     """Run the server."""
-    async with websockets.serve(handle_client, "localhost", 9300):
+    async with websockets.serve(
+        handle_client,
+        "localhost",
+        9300,
+        select_subprotocol=_select_subprotocol,
+        # Frames are tiny JSON-RPC messages, where deflate costs more than it
+        # saves, and keepalive pings aren't needed on localhost
+        compression=None,
+        max_size=64 * 1024,
+        ping_interval=None,
+    ):
         logger.info("Server started on ws://localhost:9300")
         await asyncio.Future()  # run forever
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if uvloop:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())